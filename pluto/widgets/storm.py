@@ -18,9 +18,11 @@ limitations under the License.
 """
 
 
-from collections import deque
+from collections import defaultdict, deque
+from collections.abc import Iterable
+from contextlib import nullcontext
 from datetime import datetime
-from json import dumps
+from time import monotonic, time
 from typing import Any
 
 from synapse.cortex import CoreApi
@@ -34,6 +36,8 @@ from textual.widgets import DataTable, Input, Static
 class Summary(Static):
     """A widget to display Storm query summaries."""
 
+    __slots__ = ("_states",)
+
     DEFAULT_CSS = """
     Summary {
         color: $text-disabled;
@@ -42,40 +46,52 @@ class Summary(Static):
         padding: 1 2 0 2;
         width: 100%;
     }
+    """
 
-    Summary.running {
-        border-bottom: hkey $accent;
-    }
+    def __init__(self, *args, **kwargs) -> None:
+        self._states = None
+        super().__init__(*args, **kwargs)
 
-    Summary.error {
-        border-bottom: hkey $error;
-        color: $error;
-    }
+    def set_state(self, state: str) -> None:
+        """Apply a state's styles directly, bypassing the CSS cascade.
 
-    Summary.success {
-        border-bottom: hkey $success;
-        color: $success;
-    }
-    """
+        The summary only has three states and flips between them on every
+        query, so the resolved colors are cached on first use instead of
+        re-running selector matching for each transition. A None color
+        falls back to the base $text-disabled rule.
+        """
+
+        states = self._states
+        if states is None:
+            colors = self.app.get_css_variables()
+            states = self._states = {
+                "running": (None, colors["accent"]),
+                "error": (colors["error"], colors["error"]),
+                "success": (colors["success"], colors["success"]),
+            }
+
+        color, border = states[state]
+        self.styles.color = color
+        self.styles.border_bottom = ("hkey", border)
 
     def error(self, err: tuple[str, dict]) -> None:
         """Set content based on a given err message."""
 
-        self.remove_class("running")
-        self.add_class("error")
+        self.set_state("error")
         self.update(f"[b i]{err[0]}[/]: {err[1]['mesg']}")
 
     def success(self, fini: dict) -> None:
         """Set content based on a given fini message."""
 
-        self.remove_class("running")
-        self.add_class("success")
+        self.set_state("success")
         self.update(f"[b]{fini['count']}[/] in [i]{fini['took'] / 1000.0:.2f}s")
 
 
 class Query(Input):
     """A widget for inputting storm commands and queries."""
 
+    __slots__ = ("_history", "_head", "_hist_size", "history_index")
+
     class Submitted(Message):
         """Input submitted."""
 
@@ -84,29 +100,53 @@ class Query(Input):
             super().__init__(sender)
 
     def __init__(self, *args, max_history: int = 1000, **kwargs) -> None:
-        self.history = deque(maxlen=max_history)
+        # history is a preallocated ring buffer: contiguous storage with
+        # O(1) indexing, unlike a deque's linked blocks, so navigation is a
+        # single modular subscript with no snapshotting
+        self._history = [None] * max_history
+        self._head = 0
+        self._hist_size = 0
         self.history_index = 0
         super().__init__(*args, **kwargs)
 
+    def record(self, query: str) -> None:
+        """Record a submitted query at the front of the history."""
+
+        self.history_index = 0
+
+        history = self._history
+        if self._hist_size and history[(self._head - 1) % len(history)] == query:
+            return
+
+        history[self._head] = query
+        self._head = (self._head + 1) % len(history)
+        self._hist_size = min(self._hist_size + 1, len(history))
+
     async def on_key(self, event: Key) -> None:
         """Key pressed."""
 
+        if not self._hist_size:
+            return
+
         if event.key == "down":
             if self.history_index > 0:
                 self.history_index -= 1
         elif event.key == "up":
-            if self.history_index < len(self.history) - 1:
+            if self.history_index < self._hist_size - 1:
                 self.history_index += 1
         else:
             return
 
-        self.value = self.history[self.history_index]
+        history = self._history
+        self.value = history[(self._head - 1 - self.history_index) % len(history)]
         self.cursor_position = len(self.value)
 
 
 class QueryBar(Static):
     """A widget for Storm query input and results summary."""
 
+    __slots__ = ("_query", "_summary")
+
     DEFAULT_CSS = """
     QueryBar {
         dock: top;
@@ -120,6 +160,11 @@ class QueryBar(Static):
             self.query = query
             super().__init__(sender)
 
+    def __init__(self, *args, **kwargs) -> None:
+        self._query = None
+        self._summary = None
+        super().__init__(*args, **kwargs)
+
     def compose(self) -> ComposeResult:
         """Create child widgets."""
 
@@ -129,36 +174,35 @@ class QueryBar(Static):
     async def on_query_submitted(self, message: Query.Submitted) -> None:
         """Storm query submitted."""
 
-        query = self.get_child_by_id("query")
-        assert isinstance(query, Query)
-        query.history_index = 0
+        self._query.record(message.query)
 
-        if not query.history:
-            query.history.append(message.query)
-        elif message.query != query.history[0]:
-            query.history.appendleft(message.query)
-
-        summary = self.get_child_by_id("summary")
-        assert isinstance(summary, Static)
-        summary.remove_class("error", "success")
-        summary.add_class("running")
+        summary = self._summary
+        summary.set_state("running")
         summary.update("[i]running...")
 
         await self.emit(self.Submitted(self, message.query))
 
     def on_mount(self) -> None:
-        """Focus on Input."""
+        """Cache child widgets and focus on Input."""
+
+        self._query = self.get_child_by_id("query")
+        self._summary = self.get_child_by_id("summary")
 
-        self.get_child_by_id("query").focus()
+        self._query.focus()
 
 
 # type alias for packed nodes
 NodeType = tuple[tuple[str, int], dict[str, Any]]
 
+# options for streaming storm queries
+STORM_OPTS = {"repr": True}
+
 
 class Nodes(Vertical):
     """A widget for displaying Synapse nodes."""
 
+    __slots__ = ("tables", "_widths")
+
     DEFAULT_CSS = """
     Nodes {
         padding: 1 0 1 1;
@@ -168,9 +212,44 @@ class Nodes(Vertical):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.tables = {}
+        self._widths = {}
+
+    def _get_or_create_table(self, form: str) -> DataTable:
+        """Get the table for a given form, creating it if it doesn't exist."""
+
+        table = self.tables.get(form)
+
+        if table is None:
+            table = DataTable()
+            table.add_column(form)
+            table.zebra_stripes = True
+            self.tables[form] = table
+            self.mount(table)
 
-    def add_nodes(self, *nodes: NodeType) -> None:
-        """Add nodes to their respective tables."""
+        return table
+
+    def add_rows(self, form: str, rows: list[tuple]) -> None:
+        """Add rows to the table for a given form."""
+
+        table = self._get_or_create_table(form)
+        table.add_rows(rows)
+
+        # track the widest cell seen per form and pin the column to it, so
+        # layout uses our incrementally-maintained width instead of relying
+        # on re-measured content widths
+        width = max(len(row[0]) for row in rows)
+        if width > self._widths.get(form, 0):
+            self._widths[form] = width
+            column = table.columns[0]
+            column.width = max(width, len(form))
+            column.auto_width = False
+
+    def add_nodes(self, nodes: Iterable[NodeType]) -> None:
+        """Add nodes to their respective tables.
+
+        Takes the nodes as a single iterable so callers can pass a reused
+        buffer without the tuple copy a *args splat would make.
+        """
 
         sorted_nodes = {}
 
@@ -185,18 +264,7 @@ class Nodes(Vertical):
                 sorted_nodes[form] = [row]
 
         for form, rows in sorted_nodes.items():
-            # get the associated table or create one if it doesn't exist
-            try:
-                table = self.tables[form]
-            except KeyError:
-                table = DataTable()
-                table.add_column(form)
-                table.zebra_stripes = True
-                self.tables[form] = table
-                self.mount(table)
-
-            # add rows to the table
-            table.add_rows(rows)
+            self.add_rows(form, rows)
 
     def clear(self) -> None:
         """Remove all tables."""
@@ -205,11 +273,14 @@ class Nodes(Vertical):
             table.remove()
 
         self.tables.clear()
+        self._widths.clear()
 
 
 class Console(Content):
     """A widget to display messages."""
 
+    __slots__ = ("_lines", "_prefix", "_second")
+
     DEFAULT_CSS = """
     Console {
         background: $background;
@@ -224,31 +295,39 @@ class Console(Content):
     """
 
     def __init__(self, *args, limit: int = 1000, **kwargs) -> None:
-        self.first = 0
-        self.limit = limit
-        self.lines = 0
+        self._lines: deque[str] = deque(maxlen=limit)
+        self._prefix = ""
+        self._second = 0
         super().__init__(*args, **kwargs)
 
-    def print(self, text: str) -> None:
-        """Add content and scroll to the bottom."""
-
-        time = datetime.utcnow().isoformat(sep=" ", timespec="seconds")
-
-        for line in [f"{time} - {line}" for line in text.splitlines()]:
-            self.mount(Static(line, id=f"line-{self.lines}"))
+    def compose(self) -> ComposeResult:
+        """Create child widgets."""
 
-            self.lines += 1
+        yield Static(id="log")
 
-            if self.lines - self.first == self.limit:
-                self.get_child_by_id(f"line-{self.first}").remove()
-                self.first += 1
+    def print(self, text: str) -> None:
+        """Add content and scroll to the bottom."""
 
+        # timestamps only carry second precision, so reformat at most once
+        # per second
+        second = int(time())
+        if second != self._second:
+            self._second = second
+            self._prefix = (
+                f"{datetime.utcnow().isoformat(sep=' ', timespec='seconds')} - "
+            )
+
+        prefix = self._prefix
+        self._lines.extend(prefix + line for line in text.splitlines())
+        self.query_one("#log", Static).update("\n".join(self._lines))
         self.scroll_end(animate=False)
 
 
 class Storm(Static):
     """A widget to submit Storm queries and view results."""
 
+    __slots__ = ("core", "_nodes", "_summary", "_console_widget")
+
     DEFAULT_CSS = """
     Storm {
         height: 100%;
@@ -260,6 +339,9 @@ class Storm(Static):
         """Initialize this instance."""
 
         self.core = core
+        self._nodes = None
+        self._summary = None
+        self._console_widget = None
         super().__init__(*args, **kwargs)
 
     def compose(self) -> ComposeResult:
@@ -269,38 +351,69 @@ class Storm(Static):
         yield Nodes(id="nodes")
         yield Console(id="console")
 
+    def on_mount(self) -> None:
+        """Cache child widgets."""
+
+        self._nodes = self.get_child_by_id("nodes")
+        self._summary = self.get_widget_by_id("summary")
+        self._console_widget = self.get_child_by_id("console")
+
     async def on_query_bar_submitted(self, message: QueryBar.Submitted) -> None:
-        """Handle a submitted Storm query."""
+        """Handle a submitted Storm query.
+
+        Note: keep this coroutine (and the other async handlers in this
+        module) pure Python. Cython-compiled coroutines awaited from Python
+        pay extra dispatch overhead per await and are slower than the
+        interpreted versions, so this module must never be cythonized.
+        """
 
         # whether previous data has been cleared
         cleared = False
 
-        nodes = self.get_child_by_id("nodes")
-        assert isinstance(nodes, Nodes)
-        summary = self.get_widget_by_id("summary")
-        assert isinstance(summary, Summary)
-        console = self.get_child_by_id("console")
-        assert isinstance(console, Console)
+        nodes = self._nodes
+        summary = self._summary
+        console = self._console_widget
 
-        # buffer 100 nodes at a time
-        # TODO: is there an optimal number here?
-        buffer = []
-        limit = 100
+        # bind the methods used per message once, so the loop below runs on
+        # local loads instead of repeated attribute lookups
+        add_rows = nodes.add_rows
+        console_print = console.print
+
+        # coalesce repaints while a flush touches several tables; Textual
+        # releases without batch_update fall back to a no-op
+        batch_update = getattr(self.app, "batch_update", nullcontext)
+
+        # buffer reprs per form and flush them all on a time budget, so the
+        # table updates roughly at frame rate whether nodes trickle in or
+        # arrive in bursts; the cap bounds memory between flushes
+        buffers = defaultdict(list)
+        interval = 0.05
+        cap = 5000
+        last_flush = monotonic()
 
         async for message_type, message_data in self.core.storm(
-            message.query, opts={"repr": True}
+            message.query, opts=STORM_OPTS
         ):
             if message_type == "node":
-                buffer.append(message_data)
+                (form, _), data = message_data
+                buffer = buffers[form]
+                buffer.append(data["repr"])
 
-                if len(buffer) == limit:
+                if monotonic() - last_flush >= interval or len(buffer) >= cap:
                     if not cleared:
                         # clear existing nodes
                         nodes.clear()
                         cleared = True
 
-                    nodes.add_nodes(*buffer)
-                    buffer.clear()
+                    with batch_update():
+                        for buffered_form, buffered in buffers.items():
+                            if buffered:
+                                add_rows(
+                                    buffered_form, [(value,) for value in buffered]
+                                )
+                                buffered.clear()
+
+                    last_flush = monotonic()
 
             elif message_type == "err":
                 summary.error(message_data)
@@ -310,15 +423,18 @@ class Storm(Static):
                 summary.success(message_data)
 
             elif message_type == "print":
-                console.print(message_data["mesg"])
+                console_print(message_data["mesg"])
 
             else:
-                console.print(dumps((message_type, message_data)))
+                console_print(f"{message_type}: {message_data!r}")
 
         # add any remaining nodes
-        if buffer:
-            if not cleared:
-                # clear existing nodes
-                nodes.clear()
+        with batch_update():
+            for form, buffer in buffers.items():
+                if buffer:
+                    if not cleared:
+                        # clear existing nodes
+                        nodes.clear()
+                        cleared = True
 
-            nodes.add_nodes(*buffer)
+                    add_rows(form, [(value,) for value in buffer])